@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: time a cold import of the backend and building the app
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = 10
+
+# Each run is a fresh interpreter so nothing is cached between measurements.
+# MongoDB points at an unroutable address: neither step may need the database.
+MEASURE = """
+import time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.create_app()
+built = time.perf_counter()
+print(imported - start, built - imported)
+"""
+
+def bench_startup():
+    print("Benchmarking ATSPAM Backend startup...")
+    print("=" * 40)
+
+    env = dict(os.environ, MONGODB_URL="mongodb://10.255.255.1:27017/", MONGODB_SERVER_SELECTION_TIMEOUT_MS="1000")
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+
+    import_times = []
+    build_times = []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", MEASURE],
+            cwd=backend_dir, env=env, capture_output=True, text=True, timeout=30
+        )
+        if result.returncode != 0:
+            print(f"❌ Startup failed:\n{result.stderr}")
+            return False
+        import_time, build_time = map(float, result.stdout.split())
+        import_times.append(import_time)
+        build_times.append(build_time)
+
+    print(f"✅ {RUNS} cold starts without a database")
+    print(f"   import main:  median {statistics.median(import_times) * 1000:.1f} ms, min {min(import_times) * 1000:.1f} ms")
+    print(f"   create_app(): median {statistics.median(build_times) * 1000:.1f} ms, min {min(build_times) * 1000:.1f} ms")
+    return True
+
+if __name__ == "__main__":
+    bench_startup()
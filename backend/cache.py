@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from datetime import datetime, date, timezone
+from typing import Optional
+import threading
+from time import monotonic
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional per-entry time to live."""
+
+    def __init__(self, maxsize: int, ttl_seconds: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if self.ttl_seconds is not None and monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Serialized /schedule/time-slots payloads keyed by day. Invalidated on slot
+# creation and booking changes; the TTL bounds staleness across workers.
+TIME_SLOT_CACHE_SIZE = 64
+TIME_SLOT_CACHE_TTL_SECONDS = 60
+time_slot_cache = LRUCache(TIME_SLOT_CACHE_SIZE, TIME_SLOT_CACHE_TTL_SECONDS)
+
+def slot_day(start_time: datetime) -> date:
+    # Slots are stored in UTC, which is also how day queries are bounded
+    if start_time.tzinfo is not None:
+        start_time = start_time.astimezone(timezone.utc)
+    return start_time.date()
+
+# Serialized /schedule/availability payloads keyed by (start, end). Any change
+# clears the whole cache, since a day can fall inside many cached ranges.
+AVAILABILITY_CACHE_SIZE = 32
+AVAILABILITY_CACHE_TTL_SECONDS = 15
+availability_cache = LRUCache(AVAILABILITY_CACHE_SIZE, AVAILABILITY_CACHE_TTL_SECONDS)
+
+def invalidate_time_slot_cache(start_time: datetime):
+    time_slot_cache.invalidate(slot_day(start_time))
+    availability_cache.clear()
\ No newline at end of file
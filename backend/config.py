@@ -0,0 +1,27 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Security
+SECRET_KEY = os.getenv("SECRET_KEY", "rajagirischoolofengineeringandtechnology")
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 5
+REFRESH_TOKEN_EXPIRE_DAYS = 7
+REVOCATION_SYNC_SECONDS = 5
+
+# MongoDB
+MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017/")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "atspam_db")
+# Fail requests quickly when MongoDB is down instead of waiting the 30s default
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+
+# Route handlers call pymongo synchronously, so they run in the threadpool.
+# The threadpool, the MongoDB connection pool and the admission limit are all
+# sized to this, since it is how many requests can actually make progress.
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", "40"))
+
+# Admission control
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", str(WORKER_THREADS)))
+OVERLOAD_RETRY_AFTER_SECONDS = 1
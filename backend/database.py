@@ -0,0 +1,56 @@
+import threading
+from config import MONGODB_URL, DATABASE_NAME, MONGODB_SERVER_SELECTION_TIMEOUT_MS, WORKER_THREADS
+
+# MongoDB connection - created on first use (or in the app lifespan), never at
+# import time, so importing the app needs neither pymongo nor a running server.
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from pymongo import MongoClient
+                _client = MongoClient(
+                    MONGODB_URL,
+                    serverSelectionTimeoutMS=MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                    maxPoolSize=WORKER_THREADS
+                )
+    return _client
+
+def get_database():
+    return get_client()[DATABASE_NAME]
+
+def close_client():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+class LazyCollection:
+    """Stands in for a pymongo collection and resolves it on each use."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __getattr__(self, attr):
+        return getattr(get_database()[self.name], attr)
+
+def ensure_indexes():
+    # Recent token revocations, read by every worker's revocation sync
+    get_database()["users"].create_index("tokens_revoked_at", sparse=True)
+    # Refresh token redemption; expired records are removed by MongoDB
+    get_database()["refresh_tokens"].create_index("jti", unique=True)
+    get_database()["refresh_tokens"].create_index("family")
+    get_database()["refresh_tokens"].create_index("expires_at", expireAfterSeconds=0)
+    # Day and range slot lookups, and booked counts per slot
+    get_database()["time_slots"].create_index("start_time")
+    get_database()["appointments"].create_index([("time_slot_id", 1), ("status", 1)])
+
+users_collection = LazyCollection("users")
+appointments_collection = LazyCollection("appointments")
+time_slots_collection = LazyCollection("time_slots")
+notifications_collection = LazyCollection("notifications")
+refresh_tokens_collection = LazyCollection("refresh_tokens")
@@ -0,0 +1,98 @@
+from datetime import datetime, date
+from typing import Optional, List, Tuple
+from pydantic import BaseModel, EmailStr
+
+class UserCreate(BaseModel):
+    email: EmailStr
+    password: str
+    name: str
+    role: str
+    phone: Optional[str] = None
+
+class UserLogin(BaseModel):
+    email: EmailStr
+    password: str
+
+class UserResponse(BaseModel):
+    id: str
+    email: str
+    name: str
+    role: str
+    phone: Optional[str] = None
+    is_active: bool
+    created_at: datetime
+
+class Token(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str
+    user: UserResponse
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class TimeSlotCreate(BaseModel):
+    start_time: datetime
+    end_time: datetime
+    is_available: bool = True
+
+class TimeSlotResponse(BaseModel):
+    id: str
+    start_time: datetime
+    end_time: datetime
+    booked_count: int = 0
+
+class DayAvailability(BaseModel):
+    date: date
+    total_slots: int
+    open_slots: int
+    # Compact [id, start_time, end_time, booked_count] rows instead of TimeSlotResponse objects
+    slots: List[Tuple[str, datetime, datetime, int]]
+
+class AvailabilityResponse(BaseModel):
+    start: date
+    end: date
+    days: List[DayAvailability] # only days that have slots
+
+class AppointmentCreate(BaseModel):
+    time_slot_id: str
+    purpose: str
+
+class AppointmentResponse(BaseModel):
+    id: str
+    user_id: str
+    time_slot_id: str
+    purpose: str
+    token_number: Optional[int] = None
+    status: str # pending, booked, active, completed, cancelled, rejected
+    booked_at: datetime
+    user_details: Optional[UserResponse] = None
+    time_slot_details: Optional[TimeSlotResponse] = None
+
+class UserStatusUpdate(BaseModel):
+    is_active: bool
+
+class UserRoleUpdate(BaseModel):
+    role: str
+
+class UserUpdate(BaseModel):
+    name: Optional[str] = None
+    phone: Optional[str] = None
+
+class PasswordUpdate(BaseModel):
+    current_password: str
+    new_password: str
+
+class AdminStats(BaseModel):
+    pending_appointments: int
+    users_by_role: dict
+    appointments_today: int
+    total_users: int
+
+class NotificationResponse(BaseModel):
+    id: str
+    user_id: str
+    message: str
+    is_read: bool
+    created_at: datetime
+    link: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,100 @@
+from fastapi import HTTPException, Request, status
+from collections import OrderedDict
+import jwt
+import math
+import threading
+from time import monotonic
+from config import SECRET_KEY, ALGORITHM
+
+# Per-route token bucket budgets: (capacity, refill window in seconds)
+RATE_LIMITS = {
+    # Per client IP and submitted email
+    "login": (5, 60),
+    "register": (3, 300),
+    # Per client IP alone; loose, since a whole campus can share one NAT address
+    "login_ip": (100, 60),
+    "register_ip": (30, 300),
+    "book": (10, 60),
+}
+
+class InMemoryRateLimitBackend:
+    """Token buckets kept in process memory.
+
+    Only valid for a single worker. Any object with the same ``consume``
+    signature (e.g. one backed by Redis) can be assigned to
+    ``rate_limit_backend`` to share budgets across workers.
+    """
+
+    # Buckets are kept in least recently used order; past this many the
+    # oldest are dropped, and a dropped bucket simply starts full again
+    MAX_BUCKETS = 10000
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token from the bucket. Returns 0 if allowed, otherwise seconds until a token is available."""
+        now = monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            if len(self._buckets) > self.MAX_BUCKETS:
+                self._buckets.popitem(last=False)
+            return 0.0 if allowed else (1 - tokens) / refill_per_second
+
+rate_limit_backend = InMemoryRateLimitBackend()
+
+def rate_limit_identity(request: Request) -> str:
+    """Key requests by the authenticated user when a valid token is present, else by client IP."""
+    authorization = request.headers.get("Authorization", "")
+    if authorization.lower().startswith("bearer "):
+        try:
+            payload = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM])
+            if payload.get("sub"):
+                return f"user:{payload['sub']}"
+        except jwt.PyJWTError:
+            pass
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+async def submitted_email(request: Request) -> str:
+    """The ``email`` field of a JSON request body, or an empty string."""
+    try:
+        # Starlette caches the parsed body, so the route still gets to read it
+        body = await request.json()
+    except ValueError:
+        return ""
+    return str(body.get("email", "")).lower() if isinstance(body, dict) else ""
+
+def enforce_rate_limit(scope: str, identity: str):
+    capacity, window_seconds = RATE_LIMITS[scope]
+    retry_after = rate_limit_backend.consume(f"{scope}:{identity}", capacity, capacity / window_seconds)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please slow down",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+class RateLimit:
+    """Dependency enforcing the ``RATE_LIMITS`` budget for a route.
+
+    With ``by_email`` the budget is per client and submitted email, and the
+    looser ``<scope>_ip`` budget caps the client as a whole, so users behind
+    one NAT address don't use up each other's attempts.
+    """
+
+    def __init__(self, scope: str, by_email: bool = False):
+        self.scope = scope
+        self.by_email = by_email
+
+    async def __call__(self, request: Request):
+        identity = rate_limit_identity(request)
+        if not self.by_email:
+            enforce_rate_limit(self.scope, identity)
+            return
+        # Per-email first, so hammering one account doesn't drain the shared budget
+        enforce_rate_limit(self.scope, f"{identity}:{await submitted_email(request)}")
+        enforce_rate_limit(f"{self.scope}_ip", identity)
\ No newline at end of file
@@ -0,0 +1,119 @@
+from fastapi import APIRouter, HTTPException, Depends
+from datetime import datetime, date, time
+from typing import List
+from bson import ObjectId
+from database import users_collection, appointments_collection, time_slots_collection
+from models import UserResponse, UserStatusUpdate, UserRoleUpdate, AdminStats
+from security import update_user_and_revoke_tokens, get_current_active_user
+
+router = APIRouter()
+
+# =================================================================
+# Admin User Management
+# =================================================================
+
+@router.get("/admin/users", response_model=List[UserResponse])
+def get_all_users(current_user: dict = Depends(get_current_active_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    all_users = []
+    for user in users_collection.find({}):
+        all_users.append(UserResponse(
+            id=str(user["_id"]),
+            email=user["email"],
+            name=user["name"],
+            role=user["role"],
+            phone=user.get("phone"),
+            is_active=user.get("is_active", True),
+            created_at=user["created_at"]
+        ))
+    return all_users
+
+@router.put("/admin/users/{user_id}/status", response_model=UserResponse)
+def update_user_status(user_id: str, status_update: UserStatusUpdate, current_user: dict = Depends(get_current_active_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    user_oid = ObjectId(user_id)
+    target_user = users_collection.find_one({"_id": user_oid})
+    if not target_user:
+        raise HTTPException(status_code=404, detail="User not found")
+        
+    updated_user = update_user_and_revoke_tokens(user_oid, {"is_active": status_update.is_active})
+    if not updated_user:
+        raise HTTPException(status_code=404, detail="User not found after update")
+
+    return UserResponse(
+        id=str(updated_user["_id"]),
+        email=updated_user["email"],
+        name=updated_user["name"],
+        role=updated_user["role"],
+        phone=updated_user.get("phone"),
+        is_active=updated_user.get("is_active", True),
+        created_at=updated_user["created_at"]
+    )
+
+@router.put("/admin/users/{user_id}/role", response_model=UserResponse)
+def update_user_role(user_id: str, role_update: UserRoleUpdate, current_user: dict = Depends(get_current_active_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    valid_roles = ["faculty", "student", "principal", "admin"]
+    if role_update.role.lower() not in valid_roles:
+        raise HTTPException(status_code=400, detail="Invalid role specified")
+        
+    user_oid = ObjectId(user_id)
+    target_user = users_collection.find_one({"_id": user_oid})
+    if not target_user:
+        raise HTTPException(status_code=404, detail="User not found")
+        
+    updated_user = update_user_and_revoke_tokens(user_oid, {"role": role_update.role.lower()})
+    if not updated_user:
+        raise HTTPException(status_code=404, detail="User not found after update")
+        
+    return UserResponse(
+        id=str(updated_user["_id"]),
+        email=updated_user["email"],
+        name=updated_user["name"],
+        role=updated_user["role"],
+        phone=updated_user.get("phone"),
+        is_active=updated_user.get("is_active", True),
+        created_at=updated_user["created_at"]
+    )
+
+@router.get("/admin/overview-stats", response_model=AdminStats)
+def get_admin_overview_stats(current_user: dict = Depends(get_current_active_user)):
+    if current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+        
+    # Pending appointments
+    pending_appointments = appointments_collection.count_documents({"status": "pending"})
+    
+    # Users by role
+    pipeline = [
+        {"$group": {"_id": "$role", "count": {"$sum": 1}}}
+    ]
+    users_by_role_cursor = users_collection.aggregate(pipeline)
+    users_by_role = {item["_id"]: item["count"] for item in users_by_role_cursor}
+    
+    # Appointments today
+    today = date.today()
+    start_of_day = datetime.combine(today, time.min)
+    end_of_day = datetime.combine(today, time.max)
+    todays_slots_cursor = time_slots_collection.find({"start_time": {"$gte": start_of_day, "$lt": end_of_day}})
+    todays_slot_ids = [str(slot["_id"]) for slot in todays_slots_cursor]
+    appointments_today = appointments_collection.count_documents({
+        "time_slot_id": {"$in": todays_slot_ids},
+        "status": {"$in": ["booked", "active"]}
+    })
+    
+    # Total users
+    total_users = users_collection.count_documents({})
+    
+    return AdminStats(
+        pending_appointments=pending_appointments,
+        users_by_role=users_by_role,
+        appointments_today=appointments_today,
+        total_users=total_users
+    )
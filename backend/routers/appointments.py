@@ -0,0 +1,235 @@
+from fastapi import APIRouter, HTTPException, Depends, status, Query
+from datetime import datetime, time
+from typing import List
+from pydantic import BaseModel
+from bson import ObjectId
+from cache import invalidate_time_slot_cache
+from database import users_collection, appointments_collection, time_slots_collection, notifications_collection
+from models import UserResponse, TimeSlotResponse, AppointmentCreate, AppointmentResponse
+from ratelimit import RateLimit
+from security import get_current_active_user
+
+router = APIRouter()
+
+# =================================================================
+# Appointment Booking Routes (For Faculty/Students)
+# =================================================================
+
+@router.post("/appointments/book", status_code=status.HTTP_201_CREATED, response_model=AppointmentResponse, dependencies=[Depends(RateLimit("book"))])
+def book_appointment(appointment_data: AppointmentCreate, current_user: dict = Depends(get_current_active_user)):
+    # Check if time slot exists
+    time_slot_id_obj = ObjectId(appointment_data.time_slot_id)
+    time_slot = time_slots_collection.find_one({"_id": time_slot_id_obj})
+    if not time_slot:
+        raise HTTPException(status_code=404, detail="Time slot not found")
+
+    # Create appointment document
+    appointment_doc = {
+        "user_id": str(current_user["_id"]),
+        "time_slot_id": appointment_data.time_slot_id,
+        "purpose": appointment_data.purpose,
+        "status": "pending",  # Appointments now start as pending
+        "token_number": None, # Token is assigned upon approval
+        "booked_at": datetime.utcnow()
+    }
+    
+    # Insert appointment
+    result = appointments_collection.insert_one(appointment_doc)
+    
+    # Prepare and return response
+    created_appointment = appointments_collection.find_one({"_id": result.inserted_id})
+    if not created_appointment:
+        raise HTTPException(status_code=500, detail="Failed to create and retrieve appointment.")
+    created_appointment["id"] = str(created_appointment.pop("_id"))
+    
+    return AppointmentResponse(**created_appointment)
+
+@router.get("/appointments/my-appointments", response_model=List[AppointmentResponse])
+def get_my_appointments(current_user: dict = Depends(get_current_active_user)):
+    user_id = str(current_user["_id"])
+    appointments_cursor = appointments_collection.find({"user_id": user_id}).sort("booked_at", -1)
+    
+    appointments = []
+    for app in appointments_cursor:
+        app["id"] = str(app.pop("_id"))
+        
+        # Fetch associated time slot details
+        time_slot = time_slots_collection.find_one({"_id": ObjectId(app["time_slot_id"])})
+        if time_slot:
+            time_slot["id"] = str(time_slot.pop("_id"))
+            # Temp fix for booked_count, ideally we should have a proper model mapping
+            time_slot["booked_count"] = appointments_collection.count_documents({"time_slot_id": app["time_slot_id"], "status": "booked"})
+            app["time_slot_details"] = TimeSlotResponse(**time_slot)
+        
+        appointments.append(AppointmentResponse(**app))
+        
+    return appointments
+
+@router.get("/appointments/pending", response_model=List[AppointmentResponse])
+def get_pending_appointments(current_user: dict = Depends(get_current_active_user)):
+    if current_user["role"] not in ["principal", "admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    pending_cursor = appointments_collection.find({"status": "pending"}).sort("booked_at", 1)
+    
+    appointments = []
+    for app in pending_cursor:
+        app["id"] = str(app.pop("_id"))
+
+        # Fetch user details
+        user = users_collection.find_one({"_id": ObjectId(app["user_id"])})
+        if user:
+            app["user_details"] = UserResponse(
+                id=str(user["_id"]),
+                email=user["email"],
+                name=user["name"],
+                role=user["role"],
+                phone=user.get("phone"),
+                is_active=user.get("is_active", True),
+                created_at=user["created_at"]
+            )
+        
+        # Fetch time slot details
+        time_slot = time_slots_collection.find_one({"_id": ObjectId(app["time_slot_id"])})
+        if time_slot:
+            time_slot["id"] = str(time_slot.pop("_id"))
+            time_slot["booked_count"] = appointments_collection.count_documents({"time_slot_id": app["time_slot_id"], "status": "booked"})
+            app["time_slot_details"] = TimeSlotResponse(**time_slot)
+
+        appointments.append(AppointmentResponse(**app))
+        
+    return appointments
+
+class AppointmentReview(BaseModel):
+    action: str # "approve" or "reject"
+
+@router.put("/appointments/{appointment_id}/review", response_model=AppointmentResponse)
+def review_appointment(appointment_id: str, review_data: AppointmentReview, current_user: dict = Depends(get_current_active_user)):
+    if current_user["role"] not in ["principal", "admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    appointment_oid = ObjectId(appointment_id)
+    appointment = appointments_collection.find_one({"_id": appointment_oid})
+
+    if not appointment:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+
+    if appointment["status"] != "pending":
+        raise HTTPException(status_code=400, detail=f"Cannot review an appointment with status '{appointment['status']}'")
+
+    action = review_data.action.lower()
+    updated_fields = {}
+    # Needed for the token number on approval and for the notification either way
+    time_slot = time_slots_collection.find_one({"_id": ObjectId(appointment["time_slot_id"])})
+
+    if action == "approve":
+        updated_fields["status"] = "booked"
+        
+        # Get the date of the appointment from its time slot
+        if not time_slot:
+            raise HTTPException(status_code=404, detail="Associated time slot not found")
+        appointment_date = time_slot["start_time"].date()
+        
+        # Determine the next token number for that day
+        start_of_day = datetime.combine(appointment_date, time.min)
+        end_of_day = datetime.combine(appointment_date, time.max)
+        
+        # Find appointments on the same day that are already booked to assign the next token
+        booked_appointments_today = appointments_collection.count_documents({
+            "status": "booked",
+            "time_slot_id": {
+                "$in": [str(slot["_id"]) for slot in time_slots_collection.find({
+                    "start_time": {"$gte": start_of_day, "$lt": end_of_day}
+                })]
+            }
+        })
+        updated_fields["token_number"] = booked_appointments_today + 1
+
+    elif action == "reject":
+        updated_fields["status"] = "rejected"
+    else:
+        raise HTTPException(status_code=400, detail="Invalid action. Must be 'approve' or 'reject'.")
+
+    appointments_collection.update_one({"_id": appointment_oid}, {"$set": updated_fields})
+    if action == "approve":
+        # Approval changes the slot's booked count
+        invalidate_time_slot_cache(time_slot["start_time"])
+    
+    # --- Create Notification ---
+    if time_slot:
+        appointment_time = time_slot['start_time'].strftime('%I:%M %p on %b %d, %Y')
+        if action == "approve":
+            message = f"Your appointment for {appointment_time} has been approved. Your token is #{updated_fields['token_number']}."
+        else: # reject
+            message = f"Your appointment request for {appointment_time} has been rejected."
+        
+        notification_doc = {
+            "user_id": appointment["user_id"],
+            "message": message,
+            "is_read": False,
+            "created_at": datetime.utcnow(),
+            "link": "/my-appointments" 
+        }
+        notifications_collection.insert_one(notification_doc)
+    # -------------------------
+
+    updated_appointment = appointments_collection.find_one({"_id": appointment_oid})
+    if not updated_appointment:
+        raise HTTPException(status_code=404, detail="Appointment not found after update")
+        
+    updated_appointment["id"] = str(updated_appointment.pop("_id"))
+    return AppointmentResponse(**updated_appointment)
+
+@router.put("/appointments/{appointment_id}/status", response_model=AppointmentResponse)
+def update_appointment_status(appointment_id: str, status: str = Query(..., enum=["active", "completed", "cancelled"]), current_user: dict = Depends(get_current_active_user)):
+    appt_obj_id = ObjectId(appointment_id)
+    appointment = appointments_collection.find_one({"_id": appt_obj_id})
+
+    if not appointment:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+
+    if current_user["role"] not in ["principal", "admin"]:
+        if appointment['user_id'] != str(current_user['_id']) or status != 'cancelled':
+             raise HTTPException(status_code=403, detail="Not authorized to perform this action")
+
+    appointments_collection.update_one({"_id": appt_obj_id}, {"$set": {"status": status}})
+
+    # Leaving 'booked' changes the slot's booked count
+    time_slot = None
+    if appointment.get("status") == "booked":
+        time_slot = time_slots_collection.find_one({"_id": ObjectId(appointment["time_slot_id"])})
+        if time_slot:
+            invalidate_time_slot_cache(time_slot["start_time"])
+    
+    # If a 'booked' appointment is 'cancelled' by a user, notify the principal
+    if status == "cancelled" and appointment.get("status") == "booked":
+        # Also make the time slot available again
+        time_slot_id = ObjectId(appointment["time_slot_id"])
+        time_slots_collection.update_one({"_id": time_slot_id}, {"$set": {"is_available": True}})
+
+        # Find the user who cancelled
+        cancelling_user = users_collection.find_one({"_id": ObjectId(appointment["user_id"])})
+        cancelling_user_name = cancelling_user["name"] if cancelling_user else "A user"
+
+        # Include the time slot (fetched above) in the message
+        appointment_time = ""
+        if time_slot:
+            appointment_time = time_slot['start_time'].strftime('%I:%M %p on %b %d, %Y')
+        
+        # Find all principals
+        principals = users_collection.find({"role": "principal"})
+        for principal in principals:
+            notification_doc = {
+                "user_id": str(principal["_id"]),
+                "message": f"{cancelling_user_name} has cancelled their appointment for {appointment_time}.",
+                "is_read": False,
+                "created_at": datetime.utcnow(),
+                "link": "/queue" # Or wherever the principal views their schedule
+            }
+            notifications_collection.insert_one(notification_doc)
+
+    updated_appointment = appointments_collection.find_one({"_id": appt_obj_id})
+    if updated_appointment:
+        updated_appointment["id"] = str(updated_appointment.pop("_id"))
+        return AppointmentResponse(**updated_appointment)
+    raise HTTPException(status_code=404, detail="Appointment not found after update")
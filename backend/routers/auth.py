@@ -0,0 +1,178 @@
+from fastapi import APIRouter, HTTPException, Depends
+from datetime import datetime
+import jwt
+from bson import ObjectId
+from config import SECRET_KEY, ALGORITHM
+from database import users_collection
+from models import UserCreate, UserLogin, UserResponse, Token, RefreshRequest, UserUpdate, PasswordUpdate
+from ratelimit import RateLimit
+from security import (
+    verify_password, get_password_hash, issue_tokens, redeem_refresh_token, update_user_and_revoke_tokens,
+    get_current_user, get_current_active_user
+)
+
+router = APIRouter()
+
+@router.post("/register", response_model=UserResponse, dependencies=[Depends(RateLimit("register", by_email=True))])
+def register(user_data: UserCreate):
+    # Check if user already exists
+    existing_user = users_collection.find_one({"email": user_data.email})
+    if existing_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    
+    # Validate role
+    valid_roles = ["faculty", "student", "principal", "admin"]
+    if user_data.role.lower() not in valid_roles:
+        raise HTTPException(status_code=400, detail="Invalid role")
+    
+    # Create user document
+    user_doc = {
+        "email": user_data.email.lower(),
+        "password": get_password_hash(user_data.password),
+        "name": user_data.name,
+        "role": user_data.role.lower(),
+        "phone": user_data.phone,
+        "is_active": True,
+        "token_version": 0,
+        "created_at": datetime.utcnow()
+    }
+    
+    # Insert user
+    result = users_collection.insert_one(user_doc)
+    user_doc["id"] = str(result.inserted_id)
+    
+    return UserResponse(**user_doc)
+
+@router.post("/login", response_model=Token, dependencies=[Depends(RateLimit("login", by_email=True))])
+def login(user_credentials: UserLogin):
+    # Find user
+    user = users_collection.find_one({"email": user_credentials.email.lower()})
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    
+    # Verify password
+    if not verify_password(user_credentials.password, user["password"]):
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    
+    # Check if user is active
+    if not user.get("is_active", True):
+        raise HTTPException(status_code=401, detail="Account is deactivated")
+    
+    # Create access and refresh tokens
+    access_token, refresh_token = issue_tokens(user)
+    
+    # Prepare user response
+    user_response = UserResponse(
+        id=str(user["_id"]),
+        email=user["email"],
+        name=user["name"],
+        role=user["role"],
+        phone=user.get("phone"),
+        is_active=user.get("is_active", True),
+        created_at=user["created_at"]
+    )
+    
+    return Token(access_token=access_token, refresh_token=refresh_token, token_type="bearer", user=user_response)
+
+@router.post("/token/refresh", response_model=Token)
+def refresh_access_token(refresh_request: RefreshRequest):
+    try:
+        payload = jwt.decode(refresh_request.refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Refresh token expired")
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+    if payload.get("type") != "refresh" or any(payload.get(claim) is None for claim in ("uid", "jti", "fam")):
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    # Each refresh token works once
+    if not redeem_refresh_token(payload["jti"], payload["fam"]):
+        raise HTTPException(status_code=401, detail="Refresh token already used")
+
+    # Refresh is the one place that reads the user, picking up role changes and revocations
+    user = users_collection.find_one({"_id": ObjectId(payload["uid"])})
+    if not user or payload.get("ver") != user.get("token_version", 0):
+        raise HTTPException(status_code=401, detail="Refresh token revoked")
+    if not user.get("is_active", True):
+        raise HTTPException(status_code=401, detail="Account is deactivated")
+
+    access_token, refresh_token = issue_tokens(user, family=payload["fam"])
+    user_response = UserResponse(
+        id=str(user["_id"]),
+        email=user["email"],
+        name=user["name"],
+        role=user["role"],
+        phone=user.get("phone"),
+        is_active=user.get("is_active", True),
+        created_at=user["created_at"]
+    )
+    return Token(access_token=access_token, refresh_token=refresh_token, token_type="bearer", user=user_response)
+
+@router.get("/me", response_model=UserResponse)
+def get_current_user_info(current_user: dict = Depends(get_current_user)):
+    user = users_collection.find_one({"_id": current_user["_id"]})
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return UserResponse(
+        id=str(user["_id"]),
+        email=user["email"],
+        name=user["name"],
+        role=user["role"],
+        phone=user.get("phone"),
+        is_active=user.get("is_active", True),
+        created_at=user["created_at"]
+    )
+
+# =================================================================
+# User Profile Management
+# =================================================================
+
+@router.put("/me/details", response_model=UserResponse)
+def update_current_user_info(user_update: UserUpdate, current_user: dict = Depends(get_current_active_user)):
+    update_data = {k: v for k, v in user_update.model_dump().items() if v is not None}
+
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No update data provided")
+
+    users_collection.update_one({"_id": current_user["_id"]}, {"$set": update_data})
+
+    updated_user = users_collection.find_one({"_id": current_user["_id"]})
+    if not updated_user:
+         raise HTTPException(status_code=404, detail="User not found after update")
+
+    return UserResponse(
+        id=str(updated_user["_id"]),
+        email=updated_user["email"],
+        name=updated_user["name"],
+        role=updated_user["role"],
+        phone=updated_user.get("phone"),
+        is_active=updated_user.get("is_active", True),
+        created_at=updated_user["created_at"]
+    )
+
+@router.put("/me/password")
+def update_current_user_password(password_update: PasswordUpdate, current_user: dict = Depends(get_current_active_user)):
+    user = users_collection.find_one({"_id": current_user["_id"]})
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Verify current password
+    if not verify_password(password_update.current_password, user["password"]):
+        raise HTTPException(status_code=400, detail="Incorrect current password")
+
+    # Hash new password
+    hashed_password = get_password_hash(password_update.new_password)
+    
+    # Update password in the database, signing out every other session
+    updated_user = update_user_and_revoke_tokens(current_user["_id"], {"password": hashed_password})
+    if not updated_user:
+        raise HTTPException(status_code=404, detail="User not found after update")
+
+    # Hand this session fresh tokens so it stays signed in
+    access_token, refresh_token = issue_tokens(updated_user)
+    return {
+        "message": "Password updated successfully",
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, status
+from typing import List
+from database import notifications_collection
+from models import NotificationResponse
+from security import get_current_active_user
+
+router = APIRouter()
+
+# =================================================================
+# Notification Routes
+# =================================================================
+
+@router.get("/notifications", response_model=List[NotificationResponse])
+def get_notifications(current_user: dict = Depends(get_current_active_user)):
+    user_id = str(current_user["_id"])
+    notifications_cursor = notifications_collection.find({"user_id": user_id}).sort("created_at", -1)
+    
+    notifications = []
+    for notif in notifications_cursor:
+        notif["id"] = str(notif.pop("_id"))
+        notifications.append(NotificationResponse(**notif))
+        
+    return notifications
+
+@router.put("/notifications/read-all", status_code=status.HTTP_204_NO_CONTENT)
+def mark_all_notifications_as_read(current_user: dict = Depends(get_current_active_user)):
+    user_id = str(current_user["_id"])
+    notifications_collection.update_many(
+        {"user_id": user_id, "is_read": False},
+        {"$set": {"is_read": True}}
+    )
+    return
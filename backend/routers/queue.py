@@ -0,0 +1,54 @@
+from fastapi import APIRouter, HTTPException, Depends
+from datetime import datetime, date, time
+from typing import List
+from bson import ObjectId
+from database import users_collection, appointments_collection, time_slots_collection
+from models import UserResponse, TimeSlotResponse, AppointmentResponse
+from security import get_current_active_user
+
+router = APIRouter()
+
+# =================================================================
+# Queue Management Routes (For Principal/Admin)
+# =================================================================
+
+@router.get("/queue/today", response_model=List[AppointmentResponse])
+def get_todays_queue(current_user: dict = Depends(get_current_active_user)):
+    if current_user["role"] not in ["principal", "admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+        
+    today = date.today()
+    start_of_day = datetime.combine(today, time.min)
+    end_of_day = datetime.combine(today, time.max)
+    
+    # Find all time slots for today
+    todays_slots_cursor = time_slots_collection.find({"start_time": {"$gte": start_of_day, "$lt": end_of_day}})
+    todays_slot_ids = [str(slot["_id"]) for slot in todays_slots_cursor]
+    
+    # Find all appointments in those time slots that are approved ('booked') or currently active
+    queue_cursor = appointments_collection.find({
+        "time_slot_id": {"$in": todays_slot_ids},
+        "status": {"$in": ["booked", "active"]}
+    }).sort("token_number", 1) # Sort by token number
+    
+    queue = []
+    for app in queue_cursor:
+        app["id"] = str(app.pop("_id"))
+        
+        user = users_collection.find_one({"_id": ObjectId(app["user_id"])})
+        if user:
+            app["user_details"] = UserResponse(
+                id=str(user["_id"]), email=user["email"], name=user["name"], 
+                role=user["role"], phone=user.get("phone"), is_active=user.get("is_active", True),
+                created_at=user["created_at"]
+            )
+        
+        time_slot = time_slots_collection.find_one({"_id": ObjectId(app["time_slot_id"])})
+        if time_slot:
+            time_slot["id"] = str(time_slot.pop("_id"))
+            time_slot["booked_count"] = 1 # Not relevant here, but model requires it
+            app["time_slot_details"] = TimeSlotResponse(**time_slot)
+            
+        queue.append(AppointmentResponse(**app))
+        
+    return queue
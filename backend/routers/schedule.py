@@ -0,0 +1,116 @@
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from datetime import datetime, date, time, timedelta
+from typing import List
+import hashlib
+import json
+from cache import time_slot_cache, availability_cache, slot_day, invalidate_time_slot_cache
+from database import appointments_collection, time_slots_collection
+from models import TimeSlotCreate, TimeSlotResponse, DayAvailability, AvailabilityResponse
+from security import get_current_active_user
+
+router = APIRouter()
+
+# Helper functions
+MAX_AVAILABILITY_DAYS = 31
+
+def find_slots_with_counts(range_start: datetime, range_end: datetime) -> List[TimeSlotResponse]:
+    """Slots starting in [range_start, range_end) with their booked counts, using one query and one aggregation."""
+    slots = list(time_slots_collection.find(
+        {"start_time": {"$gte": range_start, "$lt": range_end}},
+        {"start_time": 1, "end_time": 1}
+    ).sort("start_time", 1))
+    slot_ids = [str(slot["_id"]) for slot in slots]
+    booked_counts = {
+        item["_id"]: item["count"]
+        for item in appointments_collection.aggregate([
+            {"$match": {"time_slot_id": {"$in": slot_ids}, "status": "booked"}},
+            {"$group": {"_id": "$time_slot_id", "count": {"$sum": 1}}}
+        ])
+    }
+    return [
+        TimeSlotResponse(
+            id=slot_id,
+            start_time=slot["start_time"],
+            end_time=slot["end_time"],
+            booked_count=booked_counts.get(slot_id, 0)
+        )
+        for slot_id, slot in zip(slot_ids, slots)
+    ]
+
+def serialize_payload(payload):
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+    # Weak, since the compression middleware sends the same ETag for every content coding
+    etag = 'W/"' + hashlib.sha1(body).hexdigest() + '"'
+    return body, etag
+
+def cached_json_response(request: Request, cached: tuple, cache_control: str):
+    body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# =================================================================
+# Schedule Management Routes (For Principal/Admin)
+# =================================================================
+
+@router.post("/schedule/time-slots", status_code=status.HTTP_201_CREATED, response_model=TimeSlotResponse)
+def create_time_slot(time_slot_data: TimeSlotCreate, current_user: dict = Depends(get_current_active_user)):
+    if current_user["role"] not in ["principal", "admin"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    time_slot_doc = time_slot_data.model_dump()
+    result = time_slots_collection.insert_one(time_slot_doc)
+    invalidate_time_slot_cache(time_slot_doc["start_time"])
+    created_slot = time_slots_collection.find_one({"_id": result.inserted_id})
+    if not created_slot:
+        raise HTTPException(status_code=500, detail="Failed to create and retrieve time slot.")
+    created_slot["id"] = str(created_slot.pop("_id"))
+    return TimeSlotResponse(**created_slot)
+
+@router.get("/schedule/time-slots", response_model=List[TimeSlotResponse])
+def get_time_slots(request: Request, day: date = Query(..., description="Get time slots for a specific day")):
+    cached = time_slot_cache.get(day)
+    if cached is None:
+        start_of_day = datetime.combine(day, time.min)
+        end_of_day = datetime.combine(day, time.max)
+        slots = find_slots_with_counts(start_of_day, end_of_day)
+        # Serialize once so every client browsing this day gets the same bytes
+        cached = serialize_payload(slots)
+        time_slot_cache.set(day, cached)
+
+    # Any day can still change (cancellations, slots added to past dates), so
+    # browsers always revalidate; the ETag turns that into a cheap 304
+    return cached_json_response(request, cached, "no-cache")
+
+@router.get("/schedule/availability", response_model=AvailabilityResponse)
+def get_availability(
+    request: Request,
+    start: date = Query(..., description="First day of the range"),
+    end: date = Query(..., description="Last day of the range (inclusive)")
+):
+    if end < start:
+        raise HTTPException(status_code=400, detail="End date must not be before start date")
+    if (end - start).days >= MAX_AVAILABILITY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_AVAILABILITY_DAYS} days")
+
+    cached = availability_cache.get((start, end))
+    if cached is None:
+        slots = find_slots_with_counts(datetime.combine(start, time.min), datetime.combine(end + timedelta(days=1), time.min))
+        days = {}
+        for slot in slots:
+            days.setdefault(slot_day(slot.start_time), []).append(slot)
+        availability = AvailabilityResponse(start=start, end=end, days=[
+            DayAvailability(
+                date=day,
+                total_slots=len(day_slots),
+                open_slots=sum(1 for slot in day_slots if slot.booked_count == 0),
+                slots=[(slot.id, slot.start_time, slot.end_time, slot.booked_count) for slot in day_slots]
+            )
+            for day, day_slots in days.items()
+        ])
+        cached = serialize_payload(availability)
+        availability_cache.set((start, end), cached)
+
+    return cached_json_response(request, cached, "no-cache")
@@ -0,0 +1,180 @@
+from fastapi import HTTPException, Depends
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, TYPE_CHECKING
+import asyncio
+import logging
+import threading
+import uuid
+import jwt
+from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS, REVOCATION_SYNC_SECONDS
+from database import users_collection, refresh_tokens_collection
+
+if TYPE_CHECKING:
+    from bson import ObjectId
+
+logger = logging.getLogger("atspam")
+
+# Password hashing - passlib and the bcrypt backend load on first use
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# JWT token security
+security = HTTPBearer()
+
+# Helper functions
+def verify_password(plain_password, hashed_password):
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+def get_password_hash(password):
+    return get_pwd_context().hash(password)
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    to_encode = data.copy()
+    if expires_delta:
+        expire = datetime.now(timezone.utc) + expires_delta
+    else:
+        expire = datetime.now(timezone.utc) + timedelta(minutes=15)
+    to_encode.update({"exp": expire, "type": "access"})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+def create_refresh_token(data: dict):
+    to_encode = data.copy()
+    expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode.update({"exp": expire, "type": "refresh"})
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+def token_claims(user: dict):
+    # Everything authorization needs, so requests don't have to load the user
+    return {
+        "sub": user["email"],
+        "uid": str(user["_id"]),
+        "role": user["role"],
+        "ver": user.get("token_version", 0)
+    }
+
+def issue_tokens(user: dict, family: Optional[str] = None):
+    """Create an access token and a single-use refresh token.
+
+    Refresh tokens from one login share a ``family``; each refresh passes the
+    family on to the next token (see ``redeem_refresh_token``).
+    """
+    claims = token_claims(user)
+    access_token = create_access_token(claims, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    jti = uuid.uuid4().hex
+    family = family or uuid.uuid4().hex
+    refresh_tokens_collection.insert_one({
+        "jti": jti,
+        "family": family,
+        "user_id": claims["uid"],
+        "used": False,
+        "expires_at": datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    })
+    return access_token, create_refresh_token({**claims, "jti": jti, "fam": family})
+
+def redeem_refresh_token(jti: str, family: str) -> bool:
+    """Mark a refresh token as used. Presenting one a second time means it leaked, so its whole family is revoked."""
+    redeemed = refresh_tokens_collection.find_one_and_update(
+        {"jti": jti, "family": family, "used": False},
+        {"$set": {"used": True}}
+    )
+    if redeemed is None:
+        refresh_tokens_collection.update_many({"family": family}, {"$set": {"used": True}})
+        return False
+    return True
+
+# Access tokens issued before a revocation have all expired this long after it,
+# so older revocations need not be kept (the sync interval covers clock skew)
+REVOCATION_WINDOW = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES, seconds=REVOCATION_SYNC_SECONDS)
+
+class TokenRevocationList:
+    """Latest token version per user, for users whose tokens were revoked recently.
+
+    A token whose ``ver`` claim is older than the recorded version is rejected.
+    Only revocations within ``REVOCATION_WINDOW`` are kept. Changes made by
+    this process apply immediately; changes made by other workers arrive with
+    the next ``sync``.
+    """
+
+    def __init__(self):
+        self._versions = {}  # email -> (token_version, revoked_at)
+        self._lock = threading.Lock()
+
+    def revoke(self, email: str, version: int, revoked_at: datetime):
+        with self._lock:
+            if version > self._versions.get(email, (0, None))[0]:
+                self._versions[email] = (version, revoked_at)
+
+    def is_revoked(self, email: str, version: int) -> bool:
+        with self._lock:
+            return version < self._versions.get(email, (0, None))[0]
+
+    def sync(self):
+        cutoff = datetime.utcnow() - REVOCATION_WINDOW
+        recent = users_collection.find(
+            {"tokens_revoked_at": {"$gte": cutoff}},
+            {"email": 1, "token_version": 1, "tokens_revoked_at": 1}
+        )
+        for user in recent:
+            self.revoke(user["email"], user["token_version"], user["tokens_revoked_at"])
+        with self._lock:
+            self._versions = {
+                email: (version, revoked_at)
+                for email, (version, revoked_at) in self._versions.items()
+                if revoked_at >= cutoff
+            }
+
+revocation_list = TokenRevocationList()
+
+async def sync_revocation_list_periodically():
+    while True:
+        try:
+            await run_in_threadpool(revocation_list.sync)
+        except Exception:
+            # Keep syncing; a failed round only delays revocations from other workers
+            logger.exception("Token revocation list sync failed")
+        await asyncio.sleep(REVOCATION_SYNC_SECONDS)
+
+def update_user_and_revoke_tokens(user_oid: "ObjectId", update_fields: dict):
+    """Apply ``update_fields`` and invalidate every token issued to the user so far."""
+    from pymongo import ReturnDocument
+    updated_user = users_collection.find_one_and_update(
+        {"_id": user_oid},
+        {"$set": {**update_fields, "tokens_revoked_at": datetime.utcnow()}, "$inc": {"token_version": 1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if updated_user:
+        revocation_list.revoke(updated_user["email"], updated_user["token_version"], updated_user["tokens_revoked_at"])
+    return updated_user
+
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    try:
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token expired")
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if payload.get("type") != "access" or any(payload.get(claim) is None for claim in ("sub", "uid", "role", "ver")):
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if revocation_list.is_revoked(payload["sub"], payload["ver"]):
+        raise HTTPException(status_code=401, detail="Token revoked")
+    return payload
+
+def get_current_user(claims: dict = Depends(verify_token)):
+    from bson import ObjectId
+    # Deactivation revokes outstanding tokens, so a valid token implies an active user
+    return {
+        "_id": ObjectId(claims["uid"]),
+        "email": claims["sub"],
+        "role": claims["role"],
+        "is_active": True
+    }
+
+def get_current_active_user(current_user: dict = Depends(get_current_user)):
+    if not current_user.get("is_active"):
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
\ No newline at end of file
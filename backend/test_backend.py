@@ -5,9 +5,27 @@ Simple test script to verify the backend is working
 
 import requests
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 
 BASE_URL = "http://localhost:8000"
 
+# Overload test settings - well above MAX_CONCURRENT_REQUESTS on the server
+OVERLOAD_CLIENTS = 200
+OVERLOAD_REQUESTS = 2000
+# p99 budgets on top of the p99 of the no-op /test route under the same load,
+# which is what the client and network alone cost on this machine.
+# Rejections must come back without waiting behind admitted requests.
+P99_LATENCY_BUDGET_SECONDS = 1.0
+P99_SHED_LATENCY_BUDGET_SECONDS = 0.25
+
+# Accounts created by the token tests (registering an existing email is fine).
+# They log in 3 times per run; login allows 5 per minute for each client IP and
+# email, so wait a minute before a third run in a row.
+TEST_ADMIN = {"email": "smoketest-admin@example.com", "password": "admin-password", "name": "Smoke Admin", "role": "admin"}
+TEST_USER = {"email": "smoketest-user@example.com", "password": "user-password", "name": "Smoke User", "role": "student"}
+
 def test_backend():
     print("Testing ATSPAM Backend...")
     print("=" * 40)
@@ -49,8 +67,220 @@ def test_backend():
         print(f"❌ Error testing CORS: {e}")
         return False
     
+    try:
+        admin = register_and_login(TEST_ADMIN)
+    except Exception as e:
+        print(f"❌ Error logging in as test admin: {e}")
+        return False
+
+    if not test_auth_tokens(admin):
+        return False
+
+    if not test_time_slot_caching():
+        return False
+
+    if not test_availability(admin):
+        return False
+
+    if not test_overload_latency():
+        return False
+
+    # Last, so nothing else runs after a budget has been used up
+    if not test_rate_limiting():
+        return False
+
     print("\n🎉 Backend tests completed successfully!")
     return True
 
+def auth_header(tokens):
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+def register_and_login(account):
+    # 400 means the account exists, 429 that this script registered recently
+    response = requests.post(f"{BASE_URL}/register", json=account)
+    if response.status_code not in (200, 400, 429):
+        raise RuntimeError(f"register returned {response.status_code}: {response.text}")
+    return login(account["email"], account["password"])
+
+def login(email, password):
+    response = requests.post(f"{BASE_URL}/login", json={"email": email, "password": password})
+    if response.status_code != 200:
+        raise RuntimeError(f"login returned {response.status_code}: {response.text}")
+    return response.json()
+
+def refresh(tokens):
+    return requests.post(f"{BASE_URL}/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+def check(label, ok):
+    print(f"{'✅' if ok else '❌'} {label}")
+    return ok
+
+def test_auth_tokens(admin):
+    # Test 4: Refresh rotation, password change and revocation on role/status changes
+    checks = []
+    try:
+        user = register_and_login(TEST_USER)
+        user_id = requests.get(f"{BASE_URL}/me", headers=auth_header(user)).json()["id"]
+
+        # Refresh tokens are single use; replaying one revokes the whole family
+        rotated = refresh(user)
+        checks.append(check("Refresh issues a new token pair", rotated.status_code == 200))
+        checks.append(check("Used refresh token is rejected", refresh(user).status_code == 401))
+        checks.append(check("Replay revokes the rotated refresh token too", refresh(rotated.json()).status_code == 401))
+
+        # Password change signs out other sessions but hands this one new tokens
+        response = requests.put(
+            f"{BASE_URL}/me/password",
+            json={"current_password": TEST_USER["password"], "new_password": "changed-password"},
+            headers=auth_header(user)
+        )
+        changed = response.json()
+        checks.append(check("Password change returns new tokens", response.status_code == 200 and "access_token" in changed and "refresh_token" in changed))
+        checks.append(check("Old access token is revoked", requests.get(f"{BASE_URL}/me", headers=auth_header(user)).status_code == 401))
+        checks.append(check("New access token works", requests.get(f"{BASE_URL}/me", headers=auth_header(changed)).status_code == 200))
+        user = requests.put(
+            f"{BASE_URL}/me/password",
+            json={"current_password": "changed-password", "new_password": TEST_USER["password"]},
+            headers=auth_header(changed)
+        ).json()
+
+        # Role change revokes both tokens
+        requests.put(f"{BASE_URL}/admin/users/{user_id}/role", json={"role": "faculty"}, headers=auth_header(admin))
+        checks.append(check("Role change revokes the access token", requests.get(f"{BASE_URL}/me", headers=auth_header(user)).status_code == 401))
+        checks.append(check("Role change revokes the refresh token", refresh(user).status_code == 401))
+
+        # Deactivation revokes the access token and blocks login until reactivated; then put the account back as it was
+        user = login(TEST_USER["email"], TEST_USER["password"])
+        requests.put(f"{BASE_URL}/admin/users/{user_id}/status", json={"is_active": False}, headers=auth_header(admin))
+        checks.append(check("Deactivation revokes the access token", requests.get(f"{BASE_URL}/me", headers=auth_header(user)).status_code == 401))
+        response = requests.put(f"{BASE_URL}/admin/users/{user_id}/status", json={"is_active": True}, headers=auth_header(admin))
+        checks.append(check("User can be reactivated", response.status_code == 200))
+        response = requests.put(f"{BASE_URL}/admin/users/{user_id}/role", json={"role": TEST_USER["role"]}, headers=auth_header(admin))
+        checks.append(check("User role is restored", response.status_code == 200 and response.json()["role"] == TEST_USER["role"]))
+    except Exception as e:
+        print(f"❌ Error testing auth tokens: {e}")
+        return False
+    return all(checks)
+
+def test_time_slot_caching():
+    # Test 5: Time slot listings carry an ETag and revalidate with 304
+    try:
+        url = f"{BASE_URL}/schedule/time-slots?day={time.strftime('%Y-%m-%d')}"
+        response = requests.get(url)
+        etag = response.headers.get("etag")
+        if not etag:
+            print("❌ Time slot response has no ETag")
+            return False
+        revalidated = requests.get(url, headers={"If-None-Match": etag})
+        print(f"✅ Time slot revalidation: {revalidated.status_code}")
+        print(f"   Content-Encoding: {response.headers.get('content-encoding', 'identity')}")
+        return revalidated.status_code == 304
+    except Exception as e:
+        print(f"❌ Error testing time slot caching: {e}")
+        return False
+
+def test_availability(admin):
+    # Test 6: Multi-day availability summary, range validation and ETag revalidation
+    checks = []
+    try:
+        # Reuse the slot from an earlier run, since slots cannot be deleted
+        day = date.today() + timedelta(days=300)
+        day_slots = requests.get(f"{BASE_URL}/schedule/time-slots?day={day}").json()
+        if not day_slots:
+            response = requests.post(
+                f"{BASE_URL}/schedule/time-slots",
+                json={"start_time": f"{day}T09:00:00", "end_time": f"{day}T09:30:00"},
+                headers=auth_header(admin)
+            )
+            checks.append(check("Time slot created for availability test", response.status_code == 201))
+            day_slots = [response.json()]
+
+        url = f"{BASE_URL}/schedule/availability?start={day}&end={day + timedelta(days=13)}"
+        response = requests.get(url)
+        days = {summary["date"]: summary for summary in response.json().get("days", [])}
+        summary = days.get(str(day), {})
+        checks.append(check("Availability lists the day with open slots", response.status_code == 200 and summary.get("open_slots", 0) >= 1))
+        checks.append(check(
+            "Availability carries compact slot rows",
+            [row[0] for row in summary.get("slots", [])] == [slot["id"] for slot in day_slots]
+            and all(len(row) == 4 for row in summary["slots"])
+        ))
+
+        revalidated = requests.get(url, headers={"If-None-Match": response.headers.get("etag", "")})
+        checks.append(check("Availability revalidates with 304", revalidated.status_code == 304))
+
+        response = requests.get(f"{BASE_URL}/schedule/availability?start={day}&end={day - timedelta(days=1)}")
+        checks.append(check("End before start is rejected", response.status_code == 400))
+        response = requests.get(f"{BASE_URL}/schedule/availability?start={day}&end={day + timedelta(days=31)}")
+        checks.append(check("Range over 31 days is rejected", response.status_code == 400))
+    except Exception as e:
+        print(f"❌ Error testing availability: {e}")
+        return False
+    return all(checks)
+
+def test_overload_latency():
+    # Test 7: Under overload the server should shed load with 503 instead of letting p99 grow unbounded
+    def timed_request(url):
+        start = time.perf_counter()
+        response = requests.get(url)
+        return response.status_code, time.perf_counter() - start
+
+    def run_load(urls):
+        with ThreadPoolExecutor(max_workers=OVERLOAD_CLIENTS) as executor:
+            return list(executor.map(timed_request, urls))
+
+    def p99(latencies):
+        latencies = sorted(latencies)
+        return latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+
+    try:
+        baseline = p99([elapsed for _, elapsed in run_load([f"{BASE_URL}/test"] * OVERLOAD_REQUESTS)])
+        # A different day per request so each one misses the time slot cache and queries MongoDB
+        results = run_load([
+            f"{BASE_URL}/schedule/time-slots?day={date.today() + timedelta(days=i % 365)}"
+            for i in range(OVERLOAD_REQUESTS)
+        ])
+    except Exception as e:
+        print(f"❌ Error during overload test: {e}")
+        return False
+
+    admitted = [elapsed for code, elapsed in results if code == 200]
+    shed = [elapsed for code, elapsed in results if code == 503]
+    if len(admitted) + len(shed) != len(results):
+        print("❌ Overload test got responses other than 200 and 503")
+        return False
+    print(f"✅ Overload test: {len(admitted)} admitted, {len(shed)} shed with 503")
+    print(f"   baseline p99 (/test): {baseline * 1000:.1f} ms")
+
+    passed = True
+    for label, latencies, budget in (
+        ("admitted", admitted, P99_LATENCY_BUDGET_SECONDS),
+        ("shed", shed, P99_SHED_LATENCY_BUDGET_SECONDS)
+    ):
+        if not latencies:
+            continue
+        print(f"   {label} p99: {p99(latencies) * 1000:.1f} ms")
+        if p99(latencies) > baseline + budget:
+            print(f"❌ {label} p99 latency exceeded baseline + {budget * 1000:.0f} ms")
+            passed = False
+    return passed
+
+def test_rate_limiting():
+    # Test 8: Repeated logins for one email must eventually be throttled.
+    # A fresh email per run, so this neither fails on reruns nor locks out real accounts.
+    try:
+        credentials = {"email": f"ratelimit-{time.time_ns()}@example.com", "password": "wrong-password"}
+        for attempt in range(20):
+            response = requests.post(f"{BASE_URL}/login", json=credentials)
+            if response.status_code == 429:
+                print(f"✅ Login rate limited after {attempt} attempts")
+                print(f"   Retry-After: {response.headers.get('retry-after')}")
+                return True
+        print("❌ Login was never rate limited")
+        return False
+    except Exception as e:
+        print(f"❌ Error testing rate limiting: {e}")
+        return False
+
 if __name__ == "__main__":
     test_backend() 
\ No newline at end of file
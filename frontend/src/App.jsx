@@ -19,6 +19,7 @@ function App() {
       } catch (err) {
         console.error('Error parsing saved user:', err)
         localStorage.removeItem('token')
+        localStorage.removeItem('refresh_token')
         localStorage.removeItem('user')
       }
     }
@@ -37,6 +38,7 @@ function App() {
   const handleLogout = () => {
     setUser(null)
     localStorage.removeItem('token')
+    localStorage.removeItem('refresh_token')
     localStorage.removeItem('user')
   }
 
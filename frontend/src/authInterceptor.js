@@ -0,0 +1,71 @@
+import axios from 'axios';
+
+const API_URL = 'http://localhost:8000';
+
+// Access tokens are short-lived. Always send the latest one, and when the API
+// answers 401 swap the refresh token for a new pair and retry once.
+axios.interceptors.request.use((config) => {
+  const token = localStorage.getItem('token');
+  if (token && config.headers?.Authorization) {
+    config.headers.Authorization = `Bearer ${token}`;
+  }
+  return config;
+});
+
+let refreshPromise = null;
+
+// Refresh tokens are single use and replaying one signs the user out
+// everywhere, so tabs take turns refreshing. Once a tab holds the lock it
+// reuses the access token another tab already stored, if there is one.
+const REFRESH_LOCK = 'atspam-token-refresh';
+
+const withRefreshLock = (callback) => (
+  navigator.locks ? navigator.locks.request(REFRESH_LOCK, callback) : callback()
+);
+
+const refreshTokens = (failedToken) => withRefreshLock(async () => {
+  const currentToken = localStorage.getItem('token');
+  if (currentToken && currentToken !== failedToken) {
+    return currentToken;
+  }
+  const refreshToken = localStorage.getItem('refresh_token');
+  if (!refreshToken) {
+    throw new Error('No refresh token');
+  }
+  const response = await axios.post(`${API_URL}/token/refresh`, { refresh_token: refreshToken });
+  const { access_token, refresh_token, user } = response.data;
+  localStorage.setItem('token', access_token);
+  localStorage.setItem('refresh_token', refresh_token);
+  localStorage.setItem('user', JSON.stringify(user));
+  return access_token;
+});
+
+axios.interceptors.response.use(
+  (response) => response,
+  async (error) => {
+    const original = error.config;
+    if (
+      error.response?.status !== 401 ||
+      !original ||
+      original._retried ||
+      original.url === `${API_URL}/token/refresh` ||
+      original.url === `${API_URL}/login`
+    ) {
+      return Promise.reject(error);
+    }
+
+    original._retried = true;
+    try {
+      // Share one refresh between requests that fail at the same time
+      const failedToken = original.headers.Authorization?.replace('Bearer ', '');
+      refreshPromise = refreshPromise || refreshTokens(failedToken);
+      const accessToken = await refreshPromise;
+      original.headers.Authorization = `Bearer ${accessToken}`;
+      return axios(original);
+    } catch (refreshError) {
+      return Promise.reject(error);
+    } finally {
+      refreshPromise = null;
+    }
+  }
+);
@@ -1,9 +1,19 @@
 import { useState, useEffect } from 'react';
 import axios from 'axios';
 
+// Days shown in the availability calendar, summarised with a single request
+const AVAILABILITY_DAYS = 14;
+
+const toDateString = (date) => date.toISOString().split('T')[0];
+
+// Availability sends each slot as a compact [id, start_time, end_time, booked_count] row
+const toTimeSlot = ([id, start_time, end_time, booked_count]) => ({ id, start_time, end_time, booked_count });
+
 const BookAppointment = ({ onClose, onBookingSuccess }) => {
-  const [selectedDate, setSelectedDate] = useState(new Date().toISOString().split('T')[0]);
+  const [selectedDate, setSelectedDate] = useState(toDateString(new Date()));
   const [timeSlots, setTimeSlots] = useState([]);
+  const [availability, setAvailability] = useState(null);
+  const [availabilityFailed, setAvailabilityFailed] = useState(false);
   const [loading, setLoading] = useState(false);
   const [bookingLoading, setBookingLoading] = useState(false);
   const [error, setError] = useState('');
@@ -13,9 +23,49 @@ const BookAppointment = ({ onClose, onBookingSuccess }) => {
 
   const token = localStorage.getItem('token');
 
+  const calendarDays = Array.from({ length: AVAILABILITY_DAYS }, (_, i) => {
+    const date = new Date();
+    date.setDate(date.getDate() + i);
+    return toDateString(date);
+  });
+  const rangeStart = calendarDays[0];
+  const rangeEnd = calendarDays[calendarDays.length - 1];
+  const isInCalendar = selectedDate >= rangeStart && selectedDate <= rangeEnd;
+  const fromAvailability = isInCalendar && !availabilityFailed;
+
   useEffect(() => {
-    fetchTimeSlots();
-  }, [selectedDate]);
+    fetchAvailability();
+  }, []);
+
+  useEffect(() => {
+    // Days in the calendar render from the availability summary; other days,
+    // or every day if the summary could not be loaded, are fetched on their own
+    if (!fromAvailability) {
+      fetchTimeSlots();
+    } else if (availability) {
+      setTimeSlots((availability[selectedDate]?.slots || []).map(toTimeSlot));
+    }
+  }, [selectedDate, availability, availabilityFailed]);
+
+  const fetchAvailability = async () => {
+    setLoading(true);
+    try {
+      const response = await axios.get(`http://localhost:8000/schedule/availability?start=${rangeStart}&end=${rangeEnd}`, {
+        headers: { 'Authorization': `Bearer ${token}` }
+      });
+      setAvailability(Object.fromEntries(response.data.days.map((day) => [day.date, day])));
+      setAvailabilityFailed(false);
+    } catch (err) {
+      console.error('Error fetching availability:', err);
+      setAvailabilityFailed(true);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  const refreshSlots = () => (
+    fromAvailability ? fetchAvailability() : Promise.all([fetchAvailability(), fetchTimeSlots()])
+  );
 
   const fetchTimeSlots = async () => {
     setLoading(true);
@@ -54,7 +104,7 @@ const BookAppointment = ({ onClose, onBookingSuccess }) => {
       });
 
       // Step 2: Refresh the time slots to show updated counts
-      await fetchTimeSlots(); 
+      await refreshSlots();
       
       // Step 3: If all is successful, show the success message
       setSuccess(`Your appointment request for ${formatTime(selectedSlot.start_time)} has been sent for approval.`);
@@ -86,6 +136,15 @@ const BookAppointment = ({ onClose, onBookingSuccess }) => {
     });
   };
 
+  const formatShortDate = (dateString) => {
+    const date = new Date(dateString);
+    return date.toLocaleDateString('en-US', {
+      weekday: 'short',
+      month: 'short',
+      day: 'numeric'
+    });
+  };
+
   const formatDate = (dateString) => {
     const date = new Date(dateString);
     return date.toLocaleDateString('en-US', { 
@@ -108,6 +167,25 @@ const BookAppointment = ({ onClose, onBookingSuccess }) => {
           {error && <div className="error-message">{error}</div>}
           {success && <div className="success-message">{success}</div>}
 
+          <div className="form-group">
+            <label>Next {AVAILABILITY_DAYS} Days</label>
+            <div className="availability-strip">
+              {calendarDays.map((day) => {
+                const summary = availability?.[day];
+                return (
+                  <button
+                    key={day}
+                    className={`availability-day ${selectedDate === day ? 'selected' : ''} ${summary?.open_slots ? 'has-open' : ''}`}
+                    onClick={() => setSelectedDate(day)}
+                  >
+                    {formatShortDate(day)}
+                    <span className="booked-count">{summary ? `${summary.open_slots}/${summary.total_slots} open` : 'No slots'}</span>
+                  </button>
+                );
+              })}
+            </div>
+          </div>
+
           <div className="form-group">
             <label htmlFor="date">Select Date</label>
             <input
@@ -96,6 +96,7 @@ const Dashboard = ({ user, onLogout }) => {
 
   const handleLogout = () => {
     localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
     onLogout();
   };
@@ -23,10 +23,11 @@ const Login = ({ onLogin }) => {
 
     try {
       const response = await axios.post('http://localhost:8000/login', formData);
-      const { access_token, user } = response.data;
+      const { access_token, refresh_token, user } = response.data;
       
-      // Store token and user data
+      // Store tokens and user data
       localStorage.setItem('token', access_token);
+      localStorage.setItem('refresh_token', refresh_token);
       localStorage.setItem('user', JSON.stringify(user));
       
       // Call parent callback
@@ -46,11 +46,14 @@ const ProfileManagement = ({ user, onClose, onUpdateSuccess }) => {
         setSuccess('');
 
         try {
-            await axios.put(
+            const response = await axios.put(
                 'http://localhost:8000/me/password',
                 { current_password: currentPassword, new_password: newPassword },
                 { headers: { Authorization: `Bearer ${token}` } }
             );
+            // Other sessions are signed out; keep this one with the new tokens
+            localStorage.setItem('token', response.data.access_token);
+            localStorage.setItem('refresh_token', response.data.refresh_token);
             setSuccess('Password changed successfully!');
             // Clear password fields
             setCurrentPassword('');